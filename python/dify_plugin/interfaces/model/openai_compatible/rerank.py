@@ -76,14 +76,16 @@ class OAICompatRerankModel(RerankModel):
             results = response.json()
 
             rerank_documents = []
-            scores = [result["relevance_score"] for result in results["results"]]
+            result_entries = results["results"]
+            scores = [result["relevance_score"] for result in result_entries]
 
             # Min-Max Normalization: Normalize scores to 0 ~ 1.0 range
             min_score = min(scores)
             max_score = max(scores)
             score_range = max_score - min_score if max_score != min_score else 1.0  # Avoid division by zero
+            inv_score_range = 1.0 / score_range
 
-            for result in results["results"]:
+            for result, score in zip(result_entries, scores, strict=True):
                 index = result["index"]
 
                 # Retrieve document text (fallback if llama.cpp rerank doesn't return it)
@@ -96,7 +98,7 @@ class OAICompatRerankModel(RerankModel):
                         text = document
 
                 # Normalize the score
-                normalized_score = (result["relevance_score"] - min_score) / score_range
+                normalized_score = (score - min_score) * inv_score_range
 
                 # Create RerankDocument object with normalized score
                 rerank_document = RerankDocument(
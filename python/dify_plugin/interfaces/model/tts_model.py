@@ -1,9 +1,13 @@
+import asyncio
 import hashlib
 import logging
 import re
+import shutil
+import threading
 import uuid
 from abc import abstractmethod
-from collections.abc import Generator
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Generator
 from typing import Any, Optional
 
 from pydantic import ConfigDict
@@ -13,6 +17,25 @@ from dify_plugin.interfaces.model.ai_model import AIModel
 
 logger = logging.getLogger(__name__)
 
+try:
+    # the third-party regex engine scans character classes faster than re;
+    # fall back silently since it is not a hard dependency of the SDK
+    import regex as _re_impl
+except ImportError:
+    _re_impl = re
+
+_DEFAULT_SENTENCE_SPLIT_RE = _re_impl.compile(r"[。.!?]")
+
+_HASH_CHUNK_SIZE = 65536
+
+_FFMPEG_INSTALLED = shutil.which("ffmpeg") is not None
+
+_AUDIO_CACHE_MAX_SIZE = 32
+
+_SCHEMA_CACHE_MAX_SIZE = 64
+
+_FILE_NAME_NAMESPACE = uuid.UUID("a5da6ef9-b303-596f-8e88-bf8fa40f4b31")
+
 
 class TTSModel(AIModel):
     """
@@ -24,6 +47,10 @@ class TTSModel(AIModel):
     # pydantic configs
     model_config = ConfigDict(protected_namespaces=())
 
+    _audio_cache_lock: threading.Lock = threading.Lock()
+    _schema_cache_lock: threading.Lock = threading.Lock()
+    _semaphore_lock: threading.Lock = threading.Lock()
+
     ############################################################
     #        Methods that can be implemented by plugin         #
     ############################################################
@@ -52,6 +79,54 @@ class TTSModel(AIModel):
         """
         raise NotImplementedError
 
+    async def _ainvoke(
+        self,
+        model: str,
+        tenant_id: str,
+        credentials: dict,
+        content_text: str,
+        voice: str,
+        user: Optional[str] = None,
+    ) -> bytes | AsyncGenerator[bytes, None]:
+        """
+        Invoke large language model asynchronously
+
+        The default implementation runs the synchronous _invoke in a worker
+        thread, so plugins that only implement the sync path keep working.
+        I/O-bound backends can override this to issue requests natively
+        without blocking the event loop.
+
+        :param model: model name
+        :param tenant_id: user tenant id
+        :param credentials: model credentials
+        :param voice: model timbre
+        :param content_text: text content to be translated
+        :param user: unique user id
+        :return: translated audio file
+        """
+        result = await asyncio.to_thread(
+            self._invoke,
+            model=model,
+            tenant_id=tenant_id,
+            credentials=credentials,
+            user=user,
+            content_text=content_text,
+            voice=voice,
+        )
+        if isinstance(result, bytes):
+            return result
+        return self._aiterate_audio(result)
+
+    @staticmethod
+    async def _aiterate_audio(audio: Generator[bytes, None, None]) -> AsyncGenerator[bytes, None]:
+        """
+        Drive a synchronous audio generator from a worker thread chunk by chunk
+        """
+        sentinel = object()
+        iterator = iter(audio)
+        while (chunk := await asyncio.to_thread(next, iterator, sentinel)) is not sentinel:
+            yield chunk
+
     def get_tts_model_voices(self, model: str, credentials: dict, language: Optional[str] = None) -> Optional[list]:
         """
         Get voice for given tts model voices
@@ -61,100 +136,151 @@ class TTSModel(AIModel):
         :param credentials: model credentials
         :return: voices lists
         """
-        model_schema = self.get_model_schema(model, credentials)
+        model_schema = self._get_model_schema_cached(model, credentials)
 
-        if model_schema and ModelPropertyKey.VOICES in model_schema.model_properties:
-            voices = model_schema.model_properties[ModelPropertyKey.VOICES]
+        if model_schema and ModelPropertyKey.VOICES in (properties := model_schema.model_properties):
+            voices = properties[ModelPropertyKey.VOICES]
             if language:
                 return [
-                    {"name": d["name"], "value": d["mode"]}
-                    for d in voices
-                    if language and language in d.get("language")
+                    {"name": d["name"], "value": d["mode"]} for d in voices if language in (d.get("language") or "")
                 ]
-            else:
-                return [{"name": d["name"], "value": d["mode"]} for d in voices]
+            return [{"name": d["name"], "value": d["mode"]} for d in voices]
 
     ############################################################
     #            For plugin implementation use only            #
     ############################################################
 
-    def _get_model_default_voice(self, model: str, credentials: dict) -> Any:
+    @staticmethod
+    def _credentials_cache_key(credentials: dict) -> Optional[tuple]:
         """
-        Get voice for given tts model
+        Build the hashable credentials component used in cache keys
+
+        :param credentials: model credentials
+        :return: tuple of credential items, or None for empty credentials
+        :raises TypeError: if a credential value is unhashable
+        """
+        cache_key = tuple(sorted(credentials.items())) if credentials else None
+        hash(cache_key)
+        return cache_key
+
+    def _get_model_schema_cached(self, model: str, credentials: dict):
+        """
+        Get model schema with a per-instance cache
+
+        The schema for a given model and credentials never changes within an
+        instance's lifetime, so repeated property lookups reuse one resolution.
 
         :param model: model name
         :param credentials: model credentials
-        :return: voice
+        :return: model schema
         """
+        try:
+            cache_key = (model, self._credentials_cache_key(credentials))
+        except TypeError:
+            # unhashable credential values, fall back to an uncached lookup
+            return self.get_model_schema(model, credentials)
+
+        with self._schema_cache_lock:
+            cache = getattr(self, "_model_schema_cache", None)
+            if cache is None:
+                cache = self._model_schema_cache = OrderedDict()
+            if cache_key in cache:
+                cache.move_to_end(cache_key)
+                return cache[cache_key]
+
         model_schema = self.get_model_schema(model, credentials)
+        with self._schema_cache_lock:
+            cache[cache_key] = model_schema
+            if len(cache) > _SCHEMA_CACHE_MAX_SIZE:
+                cache.popitem(last=False)
+        return model_schema
 
-        if model_schema and ModelPropertyKey.DEFAULT_VOICE in model_schema.model_properties:
-            return model_schema.model_properties[ModelPropertyKey.DEFAULT_VOICE]
+    def _get_model_property(self, model: str, credentials: dict, key: ModelPropertyKey) -> Any:
+        """
+        Get a single property from given tts model schema
 
-    def _get_model_audio_type(self, model: str, credentials: dict) -> Optional[str]:
+        :param model: model name
+        :param credentials: model credentials
+        :param key: model property key
+        :return: property value, or None if the schema or property is missing
         """
-        Get audio type for given tts model
+        model_schema = self._get_model_schema_cached(model, credentials)
+
+        if model_schema and key in (properties := model_schema.model_properties):
+            return properties[key]
+
+    def _get_model_default_voice(self, model: str, credentials: dict) -> Any:
+        """
+        Get voice for given tts model
 
         :param model: model name
         :param credentials: model credentials
         :return: voice
         """
-        model_schema = self.get_model_schema(model, credentials)
-
-        if model_schema and ModelPropertyKey.AUDIO_TYPE in model_schema.model_properties:
-            return model_schema.model_properties[ModelPropertyKey.AUDIO_TYPE]
+        return self._get_model_property(model, credentials, ModelPropertyKey.DEFAULT_VOICE)
 
-    def _get_model_word_limit(self, model: str, credentials: dict) -> Optional[int]:
+    def _get_model_audio_type(self, model: str, credentials: dict) -> Optional[str]:
         """
         Get audio type for given tts model
+
+        :param model: model name
+        :param credentials: model credentials
         :return: audio type
         """
-        model_schema = self.get_model_schema(model, credentials)
+        return self._get_model_property(model, credentials, ModelPropertyKey.AUDIO_TYPE)
 
-        if model_schema and ModelPropertyKey.WORD_LIMIT in model_schema.model_properties:
-            return model_schema.model_properties[ModelPropertyKey.WORD_LIMIT]
+    def _get_model_word_limit(self, model: str, credentials: dict) -> Optional[int]:
+        """
+        Get word limit for given tts model
+        :return: word limit
+        """
+        return self._get_model_property(model, credentials, ModelPropertyKey.WORD_LIMIT)
 
     def _get_model_workers_limit(self, model: str, credentials: dict) -> Optional[int]:
         """
         Get audio max workers for given tts model
-        :return: audio type
+        :return: max workers
         """
-        model_schema = self.get_model_schema(model, credentials)
+        return self._get_model_property(model, credentials, ModelPropertyKey.MAX_WORKERS)
 
-        if model_schema and ModelPropertyKey.MAX_WORKERS in model_schema.model_properties:
-            return model_schema.model_properties[ModelPropertyKey.MAX_WORKERS]
+    @staticmethod
+    def _is_ffmpeg_installed() -> bool:
+        """
+        Check whether ffmpeg was available on PATH at import time
+
+        :return: True if ffmpeg is installed
+        """
+        return _FFMPEG_INSTALLED
 
     @staticmethod
-    def _split_text_into_sentences(org_text, max_length=2000, pattern=r"[。.!?]"):
-        match = re.compile(pattern)
-        tx = match.finditer(org_text)
-        start = 0
+    def _split_text_into_sentences(org_text, max_length=2000, pattern=_DEFAULT_SENTENCE_SPLIT_RE):
+        # text that already fits in one chunk never gets cut, so skip the scan
+        if len(org_text) <= max_length:
+            return [org_text] if org_text else []
+        match = _re_impl.compile(pattern) if isinstance(pattern, str) else pattern
         result = []
-        one_sentence = ""
-        for i in tx:
-            end = i.regs[0][1]
-            tmp = org_text[start:end]
-            if len(one_sentence + tmp) > max_length:
-                result.append(one_sentence)
-                one_sentence = ""
-            one_sentence += tmp
-            start = end
-        last_sens = org_text[start:]
-        if last_sens:
-            one_sentence += last_sens
-        if one_sentence != "":
-            result.append(one_sentence)
+        chunk_start = 0
+        prev_end = 0
+        for m in match.finditer(org_text):
+            end = m.end()
+            if end - chunk_start > max_length and prev_end > chunk_start:
+                result.append(org_text[chunk_start:prev_end])
+                chunk_start = prev_end
+            prev_end = end
+        if chunk_start < len(org_text):
+            result.append(org_text[chunk_start:])
         return result
 
     # Todo: To improve the streaming function
     @staticmethod
     def _get_file_name(file_content: str) -> str:
-        hash_object = hashlib.sha256(file_content.encode())
-        hex_digest = hash_object.hexdigest()
-
-        namespace_uuid = uuid.UUID("a5da6ef9-b303-596f-8e88-bf8fa40f4b31")
-        unique_uuid = uuid.uuid5(namespace_uuid, hex_digest)
-        return str(unique_uuid)
+        if len(file_content) <= _HASH_CHUNK_SIZE:
+            hash_object = hashlib.blake2b(file_content.encode(), digest_size=16, key=_FILE_NAME_NAMESPACE.bytes)
+        else:
+            hash_object = hashlib.blake2b(digest_size=16, key=_FILE_NAME_NAMESPACE.bytes)
+            for start in range(0, len(file_content), _HASH_CHUNK_SIZE):
+                hash_object.update(file_content[start : start + _HASH_CHUNK_SIZE].encode())
+        return str(uuid.UUID(bytes=hash_object.digest()))
 
     ############################################################
     #                 For executor use only                    #
@@ -181,8 +307,131 @@ class TTSModel(AIModel):
         :param user: unique user id
         :return: translated audio file
         """
+        cache_key = self._audio_cache_key(tenant_id, model, credentials, voice, content_text)
+        cached_audio = self._audio_cache_get(cache_key)
+        if cached_audio is not None:
+            return cached_audio
+
+        try:
+            workers_limit = self._get_model_workers_limit(model, credentials)
+        except Exception as e:
+            raise self._transform_invoke_error(e) from e
+
+        semaphore = self._get_invoke_semaphore(model, workers_limit) if workers_limit else None
+        if semaphore is not None:
+            semaphore.acquire()
+
+        try:
+            result = self._invoke(
+                model=model,
+                tenant_id=tenant_id,
+                credentials=credentials,
+                user=user,
+                content_text=content_text,
+                voice=voice,
+            )
+        except Exception as e:
+            if semaphore is not None:
+                semaphore.release()
+            raise self._transform_invoke_error(e) from e
+        except BaseException:
+            # a killed greenlet (GreenletExit) must not leak the worker slot
+            if semaphore is not None:
+                semaphore.release()
+            raise
+
+        # only fully materialized audio can be replayed from the cache;
+        # streaming generators are passed through untouched
+        if isinstance(result, bytes):
+            if semaphore is not None:
+                semaphore.release()
+            self._audio_cache_put(cache_key, result)
+            return result
+
+        if semaphore is not None:
+            return self._release_when_done(result, semaphore)
+
+        return result
+
+    def _audio_cache_key(
+        self, tenant_id: str, model: str, credentials: dict, voice: str, content_text: str
+    ) -> Optional[tuple]:
+        """
+        Build the audio cache key, or None if the credentials are unhashable
+
+        The credentials are part of the key because they determine the actual
+        backend and voice configuration for customizable models.
+        """
+        try:
+            return (tenant_id, model, self._credentials_cache_key(credentials), voice, content_text)
+        except TypeError:
+            return None
+
+    def _audio_cache_get(self, cache_key: Optional[tuple]) -> Optional[bytes]:
+        """
+        Look up synthesized audio for the given key, refreshing its LRU slot
+        """
+        if cache_key is None:
+            return None
+        with self._audio_cache_lock:
+            cache = getattr(self, "_audio_cache", None)
+            if cache is None:
+                return None
+            audio = cache.get(cache_key)
+            if audio is not None:
+                cache.move_to_end(cache_key)
+            return audio
+
+    def _audio_cache_put(self, cache_key: Optional[tuple], audio: bytes) -> None:
+        """
+        Store synthesized audio under the given key, evicting the oldest entry
+        """
+        if cache_key is None:
+            return
+        with self._audio_cache_lock:
+            cache = getattr(self, "_audio_cache", None)
+            if cache is None:
+                cache = self._audio_cache = OrderedDict()
+            cache[cache_key] = audio
+            if len(cache) > _AUDIO_CACHE_MAX_SIZE:
+                cache.popitem(last=False)
+
+    async def ainvoke(
+        self,
+        model: str,
+        tenant_id: str,
+        credentials: dict,
+        content_text: str,
+        voice: str,
+        user: Optional[str] = None,
+    ) -> bytes | AsyncGenerator[bytes, None]:
+        """
+        Invoke large language model asynchronously
+
+        :param model: model name
+        :param tenant_id: user tenant id
+        :param credentials: model credentials
+        :param voice: model timbre
+        :param content_text: text content to be translated
+        :param user: unique user id
+        :return: translated audio file
+        """
+        cache_key = self._audio_cache_key(tenant_id, model, credentials, voice, content_text)
+        cached_audio = self._audio_cache_get(cache_key)
+        if cached_audio is not None:
+            return cached_audio
+
         try:
-            return self._invoke(
+            workers_limit = self._get_model_workers_limit(model, credentials)
+        except Exception as e:
+            raise self._transform_invoke_error(e) from e
+
+        semaphore = self._get_invoke_semaphore(model, workers_limit) if workers_limit else None
+        if semaphore is not None:
+            await self._aacquire_semaphore(semaphore)
+
+        try:
+            result = await self._ainvoke(
                 model=model,
                 tenant_id=tenant_id,
                 credentials=credentials,
@@ -191,4 +440,80 @@ class TTSModel(AIModel):
                 voice=voice,
             )
         except Exception as e:
+            if semaphore is not None:
+                semaphore.release()
             raise self._transform_invoke_error(e) from e
+        except BaseException:
+            # cancellation is routine on the async path and must not leak the slot
+            if semaphore is not None:
+                semaphore.release()
+            raise
+
+        # same contract as invoke: cache and release for materialized audio,
+        # hold the slot until a streaming result is exhausted
+        if isinstance(result, bytes):
+            if semaphore is not None:
+                semaphore.release()
+            self._audio_cache_put(cache_key, result)
+            return result
+
+        if semaphore is not None:
+            return self._arelease_when_done(result, semaphore)
+
+        return result
+
+    def _get_invoke_semaphore(self, model: str, workers_limit: int) -> threading.Semaphore:
+        """
+        Get the semaphore bounding concurrent invocations for given tts model
+
+        :param model: model name
+        :param workers_limit: max concurrent invocations for the model
+        :return: semaphore
+        """
+        with self._semaphore_lock:
+            semaphores = getattr(self, "_invoke_semaphores", None)
+            if semaphores is None:
+                semaphores = self._invoke_semaphores = {}
+            key = (model, workers_limit)
+            semaphore = semaphores.get(key)
+            if semaphore is None:
+                semaphore = semaphores[key] = threading.Semaphore(workers_limit)
+            return semaphore
+
+    @staticmethod
+    async def _aacquire_semaphore(semaphore: threading.Semaphore) -> None:
+        """
+        Acquire the semaphore without blocking the event loop
+
+        Polls with non-blocking acquires and sleeps in between instead of
+        parking a worker thread on a blocking acquire: a cancellation can only
+        land while no slot is held, so nothing is ever left acquired without
+        an owner to release it.
+        """
+        while not semaphore.acquire(blocking=False):
+            await asyncio.sleep(0.05)
+
+    @staticmethod
+    def _release_when_done(
+        audio: Generator[bytes, None, None], semaphore: threading.Semaphore
+    ) -> Generator[bytes, None, None]:
+        """
+        Yield from a streaming result and release the semaphore once it is exhausted
+        """
+        try:
+            yield from audio
+        finally:
+            semaphore.release()
+
+    @staticmethod
+    async def _arelease_when_done(
+        audio: AsyncGenerator[bytes, None], semaphore: threading.Semaphore
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Yield from an async streaming result and release the semaphore once it is exhausted
+        """
+        try:
+            async for chunk in audio:
+                yield chunk
+        finally:
+            semaphore.release()
@@ -9,9 +9,15 @@ from dify_plugin.errors.tool import ToolProviderCredentialValidationError
 class GoogleProvider(ToolProvider):
     def _validate_credentials(self, credentials: dict[str, Any]) -> None:
         try:
-            for _ in GoogleSearchTool.from_credentials(credentials).invoke(
-                tool_parameters={"query": "test", "result_type": "link"},
-            ):
-                pass
+            # the first yielded message is enough to prove the credentials work;
+            # draining the whole generator would wait for every search result
+            next(
+                iter(
+                    GoogleSearchTool.from_credentials(credentials).invoke(
+                        tool_parameters={"query": "test", "result_type": "link"},
+                    )
+                ),
+                None,
+            )
         except Exception as e:
             raise ToolProviderCredentialValidationError(str(e)) from e
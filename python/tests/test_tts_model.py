@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from dify_plugin.entities import I18nObject
+from dify_plugin.entities.model import AIModelEntity, ModelPropertyKey, ModelType
+from dify_plugin.interfaces.model.tts_model import TTSModel
+
+
+class _StaticTTSModel(TTSModel):
+    invoke_count = 0
+    raise_once: type[BaseException] | None = None
+
+    def _invoke(self, model, tenant_id, credentials, content_text, voice, user=None):
+        if self.raise_once is not None:
+            exception_type = self.raise_once
+            self.raise_once = None
+            raise exception_type()
+        self.invoke_count += 1
+        return b"audio"
+
+    def validate_credentials(self, model, credentials):
+        pass
+
+    @property
+    def _invoke_error_mapping(self):
+        return {}
+
+
+def _build_tts_model() -> _StaticTTSModel:
+    schema = AIModelEntity(
+        model="tts-1",
+        label=I18nObject(en_US="tts-1"),
+        model_type=ModelType.TTS,
+        model_properties={
+            ModelPropertyKey.MAX_WORKERS: 1,
+            ModelPropertyKey.VOICES: [
+                {"name": "Alloy", "mode": "alloy", "language": "en-US"},
+                {"name": "Nova", "mode": "nova", "language": None},
+            ],
+        },
+    )
+    return _StaticTTSModel([schema])
+
+
+def test_get_tts_model_voices_skips_voice_without_language():
+    model = _build_tts_model()
+    assert model.get_tts_model_voices("tts-1", {}, language="en-US") == [{"name": "Alloy", "value": "alloy"}]
+
+
+def test_invoke_audio_cache_distinguishes_credentials():
+    model = _build_tts_model()
+    assert model.invoke("tts-1", "tenant", {"api_key": "a"}, "Hello.", "alloy") == b"audio"
+    assert model.invoke("tts-1", "tenant", {"api_key": "a"}, "Hello.", "alloy") == b"audio"
+    assert model.invoke_count == 1
+    assert model.invoke("tts-1", "tenant", {"api_key": "b"}, "Hello.", "alloy") == b"audio"
+    assert model.invoke_count == 2
+
+
+class _GreenletKilled(BaseException):
+    pass
+
+
+def test_invoke_releases_worker_slot_on_base_exception():
+    model = _build_tts_model()
+    model.raise_once = _GreenletKilled
+    with pytest.raises(_GreenletKilled):
+        model.invoke("tts-1", "tenant", {"api_key": "a"}, "Hello.", "alloy")
+    semaphore = model._get_invoke_semaphore("tts-1", 1)
+    assert semaphore.acquire(blocking=False)
+    semaphore.release()
+
+
+def test_ainvoke_uses_audio_cache():
+    model = _build_tts_model()
+
+    async def synthesize_twice():
+        first = await model.ainvoke("tts-1", "tenant", {"api_key": "a"}, "Hello.", "alloy")
+        second = await model.ainvoke("tts-1", "tenant", {"api_key": "a"}, "Hello.", "alloy")
+        return first, second
+
+    first, second = asyncio.run(synthesize_twice())
+    assert first == second == b"audio"
+    assert model.invoke_count == 1
+
+
+def test_ainvoke_releases_worker_slot_on_base_exception():
+    model = _build_tts_model()
+    model.raise_once = _GreenletKilled
+
+    async def synthesize():
+        await model.ainvoke("tts-1", "tenant", {"api_key": "a"}, "Hello.", "alloy")
+
+    with pytest.raises(_GreenletKilled):
+        asyncio.run(synthesize())
+    semaphore = model._get_invoke_semaphore("tts-1", 1)
+    assert semaphore.acquire(blocking=False)
+    semaphore.release()
+
+
+def test_aacquire_semaphore_cancellation_holds_no_slot():
+    model = _build_tts_model()
+    semaphore = model._get_invoke_semaphore("tts-1", 1)
+    assert semaphore.acquire(blocking=False)
+
+    async def cancel_waiting_acquire():
+        task = asyncio.ensure_future(model._aacquire_semaphore(semaphore))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_waiting_acquire())
+    semaphore.release()
+    assert semaphore.acquire(blocking=False)
+    semaphore.release()
+
+
+def test_schema_lookup_with_unhashable_credentials():
+    model = _build_tts_model()
+    credentials = {"nested": ["x"]}
+    assert model.get_tts_model_voices("tts-1", credentials, language="en-US") == [{"name": "Alloy", "value": "alloy"}]
+    assert model._get_model_word_limit("tts-1", credentials) is None
+
+
+def test_split_text_into_sentences_short_text():
+    assert TTSModel._split_text_into_sentences("Hello. World!", 2000) == ["Hello. World!"]
+
+
+def test_split_text_into_sentences_packs_up_to_max_length():
+    assert TTSModel._split_text_into_sentences("a.b.c.d.e.", 4) == ["a.b.", "c.d.", "e."]
+
+
+def test_split_text_into_sentences_keeps_trailing_text():
+    assert TTSModel._split_text_into_sentences("First. Second", 2000) == ["First. Second"]
+
+
+def test_split_text_into_sentences_empty_text():
+    assert TTSModel._split_text_into_sentences("", 2000) == []
+
+
+def test_split_text_into_sentences_custom_pattern():
+    assert TTSModel._split_text_into_sentences("a;b;c", 2, pattern=r"[;]") == ["a;", "b;c"]